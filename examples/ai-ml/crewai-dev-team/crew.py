@@ -4,40 +4,202 @@ CrewAI Development Team - AI-powered software development crew
 This crew provides automated codebase review, suggestions, documentation, and development support.
 """
 
+import asyncio
+import functools
 import os
-from crewai import Agent, Task, Crew, Process
-from crewai_tools import (
-    FileReadTool,
-    DirectoryReadTool,
-    CodeDocsSearchTool,
-    GithubSearchTool
-)
-from langchain_openai import ChatOpenAI
+import threading
+import time
+
+# The crewai/langchain imports below are deliberately deferred into the
+# cached factories and setup methods: they cost hundreds of ms and tens
+# of MB at import, which --help and argparse-error paths shouldn't pay.
+
+class RateLimiter:
+    """Token-bucket limiter keeping LLM call bursts under provider quotas"""
 
-# Initialize LLM
-llm = ChatOpenAI(
-    model="gpt-4-turbo-preview",
-    temperature=0.1
+    def __init__(self, requests_per_minute: int = 60):
+        self.capacity = requests_per_minute
+        self.fill_rate = requests_per_minute / 60.0
+        self.tokens = float(requests_per_minute)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request token is available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity,
+                    self.tokens + (now - self.updated) * self.fill_rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.fill_rate
+            time.sleep(wait)
+
+# With five agents (times N projects in analyze_many) hitting the API at
+# once, unthrottled bursts trip 429s and abort runs; the bucket smooths
+# bursts pre-emptively and max_retries in make_llm absorbs whatever remains
+rate_limiter = RateLimiter(
+    requests_per_minute=int(os.environ.get("OPENAI_RPM_LIMIT", "60"))
 )
 
-# Initialize tools
-file_read_tool = FileReadTool()
-directory_read_tool = DirectoryReadTool()
-code_docs_search_tool = CodeDocsSearchTool()
-github_search_tool = GithubSearchTool()
+def make_file_write_handler():
+    """Callback streaming LLM tokens to an attached transcript file"""
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class FileWriteCallbackHandler(BaseCallbackHandler):
+        """Append streamed LLM tokens to the attached transcript file"""
+
+        def __init__(self):
+            self.file = None
+
+        def on_llm_new_token(self, token: str, **kwargs):
+            if self.file is not None:
+                self.file.write(token)
+                self.file.flush()
+
+    # Streams tokens to disk while a transcript file is attached in
+    # analyze_codebase_async, so output is on disk as it is generated
+    # instead of buffered in memory until the whole crew finishes.
+    # Deliberately NOT a shared singleton: each agent gets its own
+    # handler so concurrent crews (and concurrent projects under
+    # analyze_many) never fight over one .file attribute.
+    return FileWriteCallbackHandler()
+
+@functools.cache
+def get_rate_limit_handler():
+    """Callback holding each LLM call until the token bucket has capacity"""
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class RateLimitCallbackHandler(BaseCallbackHandler):
+        """Hold each LLM call until the token bucket has capacity"""
+
+        def __init__(self, limiter: RateLimiter):
+            self.limiter = limiter
+
+        def on_llm_start(self, serialized, prompts, **kwargs):
+            self.limiter.acquire()
+
+    return RateLimitCallbackHandler(rate_limiter)
+
+@functools.cache
+def get_http_clients():
+    """Shared pooled HTTP clients so every LLM call reuses connections"""
+    import atexit
+    import httpx
+
+    # Without a shared client each agent call can open a fresh HTTPS
+    # connection to the API, re-paying DNS and the TLS handshake; one
+    # keep-alive pool amortizes that across the whole run
+    limits = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    timeout = httpx.Timeout(60.0)
+    sync_client = httpx.Client(limits=limits, timeout=timeout)
+    async_client = httpx.AsyncClient(limits=limits, timeout=timeout)
+    atexit.register(sync_client.close)
+    atexit.register(lambda: asyncio.run(async_client.aclose()))
+    return sync_client, async_client
+
+def make_llm(model: str, file_write_handler):
+    """Build a ChatOpenAI with the shared streaming/throttling/retry setup"""
+    from langchain_core.callbacks import StreamingStdOutCallbackHandler
+    from langchain_openai import ChatOpenAI
+
+    sync_client, async_client = get_http_clients()
+    return ChatOpenAI(
+        model=model,
+        temperature=0.1,
+        streaming=True,
+        max_retries=5,
+        request_timeout=30,
+        http_client=sync_client,
+        http_async_client=async_client,
+        callbacks=[
+            get_rate_limit_handler(),
+            StreamingStdOutCallbackHandler(),
+            file_write_handler
+        ]
+    )
+
+@functools.cache
+def setup_llm_cache():
+    """Install a process-wide SQLite cache in front of the LLM"""
+    from langchain_community.cache import SQLiteCache
+    from langchain_core.globals import set_llm_cache
+
+    # Repeat analyses of the same project re-send identical prompts;
+    # caching responses locally turns those calls into free lookups
+    # instead of full-price, full-latency API round-trips.
+    # set_llm_cache mutates process-global state, so the cache lives at
+    # one stable per-user location and is installed exactly once —
+    # repointing it per project would make concurrent analyze_many runs
+    # cache one project's responses into another's database. Entries
+    # from different projects can't collide: every task prompt embeds
+    # its project_path, so exact-match lookups stay project-specific.
+    cache_dir = os.path.join(
+        os.path.expanduser("~"), ".cache", "crewai-dev-team"
+    )
+    os.makedirs(cache_dir, exist_ok=True)
+    set_llm_cache(SQLiteCache(
+        database_path=os.path.join(cache_dir, "crew_llm_cache.db")
+    ))
+
+@functools.cache
+def get_tools():
+    """Instantiate the shared crewai tools on first use"""
+    from crewai_tools import (
+        FileReadTool,
+        DirectoryReadTool,
+        CodeDocsSearchTool,
+        GithubSearchTool
+    )
+
+    return {
+        "file_read": FileReadTool(),
+        "directory_read": DirectoryReadTool(),
+        "code_docs_search": CodeDocsSearchTool(),
+        "github_search": GithubSearchTool()
+    }
 
 class DevelopmentCrew:
     """AI Development Team using CrewAI for comprehensive codebase management"""
     
     def __init__(self, project_path: str = "."):
         self.project_path = project_path
+        setup_llm_cache()
         self.setup_agents()
         self.setup_tasks()
         self.setup_crew()
-    
+
     def setup_agents(self):
         """Create specialized AI agents for different development tasks"""
-        
+        from crewai import Agent
+
+        tools = get_tools()
+
+        # One LLM and transcript handler per agent, owned by this
+        # instance, so each crew's streamed tokens land in their own
+        # transcript file instead of a shared, character-interleaved one.
+        # The flagship model goes to reasoning-heavy review work, a
+        # cheaper/faster model to documentation and DevOps tasks.
+        self.file_write_handlers = {}
+
+        def agent_llm(name, model):
+            handler = make_file_write_handler()
+            self.file_write_handlers[name] = handler
+            return make_llm(model, handler)
+
+        llms = {
+            "code_review": agent_llm("code_review", "gpt-4-turbo-preview"),
+            "architecture": agent_llm("architecture", "gpt-4-turbo-preview"),
+            "documentation": agent_llm("documentation", "gpt-4o-mini"),
+            "devops": agent_llm("devops", "gpt-4o-mini"),
+            "security": agent_llm("security", "gpt-4-turbo-preview")
+        }
+
         # Code Reviewer Agent
         self.code_reviewer = Agent(
             role="Senior Code Reviewer",
@@ -46,8 +208,8 @@ class DevelopmentCrew:
             in code review across multiple programming languages. You have expertise in 
             security vulnerabilities, performance optimization, code maintainability, 
             and industry best practices.""",
-            tools=[file_read_tool, directory_read_tool, code_docs_search_tool],
-            llm=llm,
+            tools=[tools["file_read"], tools["directory_read"], tools["code_docs_search"]],
+            llm=llms["code_review"],
             verbose=True,
             allow_delegation=False
         )
@@ -59,8 +221,8 @@ class DevelopmentCrew:
             backstory="""You are a principal software architect with expertise in 
             distributed systems, microservices, design patterns, and scalable architecture. 
             You focus on system design, component interaction, and architectural best practices.""",
-            tools=[file_read_tool, directory_read_tool, github_search_tool],
-            llm=llm,
+            tools=[tools["file_read"], tools["directory_read"], tools["github_search"]],
+            llm=llms["architecture"],
             verbose=True,
             allow_delegation=False
         )
@@ -72,8 +234,8 @@ class DevelopmentCrew:
             backstory="""You are a technical writer with deep understanding of software 
             development. You excel at creating API documentation, README files, code comments, 
             architecture diagrams, and user guides that are clear and useful.""",
-            tools=[file_read_tool, directory_read_tool, code_docs_search_tool],
-            llm=llm,
+            tools=[tools["file_read"], tools["directory_read"], tools["code_docs_search"]],
+            llm=llms["documentation"],
             verbose=True,
             allow_delegation=False
         )
@@ -85,8 +247,8 @@ class DevelopmentCrew:
             backstory="""You are a DevOps engineer with expertise in GitHub Actions, 
             Docker, Kubernetes, cloud platforms, and automation. You focus on improving 
             development workflows, deployment pipelines, and operational excellence.""",
-            tools=[file_read_tool, directory_read_tool, github_search_tool],
-            llm=llm,
+            tools=[tools["file_read"], tools["directory_read"], tools["github_search"]],
+            llm=llms["devops"],
             verbose=True,
             allow_delegation=False
         )
@@ -98,14 +260,15 @@ class DevelopmentCrew:
             backstory="""You are a security engineer with expertise in application security, 
             dependency scanning, SAST/DAST tools, and security compliance. You focus on 
             identifying and mitigating security risks in code and infrastructure.""",
-            tools=[file_read_tool, directory_read_tool, code_docs_search_tool],
-            llm=llm,
+            tools=[tools["file_read"], tools["directory_read"], tools["code_docs_search"]],
+            llm=llms["security"],
             verbose=True,
             allow_delegation=False
         )
     
     def setup_tasks(self):
         """Define specific tasks for each agent"""
+        from crewai import Task
         
         # Code Review Task
         self.code_review_task = Task(
@@ -193,79 +356,260 @@ class DevelopmentCrew:
         )
     
     def setup_crew(self):
-        """Initialize the crew with agents and tasks"""
-        
-        self.crew = Crew(
-            agents=[
-                self.code_reviewer,
-                self.architecture_advisor,
-                self.documentation_specialist,
-                self.devops_engineer,
-                self.security_specialist
-            ],
-            tasks=[
-                self.code_review_task,
-                self.architecture_task,
-                self.documentation_task,
-                self.devops_task,
-                self.security_task
-            ],
-            process=Process.sequential,
-            verbose=True
-        )
-    
-    def analyze_codebase(self):
-        """Run the complete codebase analysis"""
+        """Initialize one single-task crew per agent so tasks can run concurrently"""
+
+        from crewai import Crew, Process
+
+        # The five review tasks share no data dependencies, so instead of one
+        # sequential crew we build a crew per agent/task pair and fan them out
+        # with asyncio. Total wall-clock drops from the sum of the task times
+        # to the slowest single task.
+        self.crews = {
+            name: Crew(
+                agents=[agent],
+                tasks=[task],
+                process=Process.sequential,
+                verbose=True
+            )
+            for name, agent, task in [
+                ("code_review", self.code_reviewer, self.code_review_task),
+                ("architecture", self.architecture_advisor, self.architecture_task),
+                ("documentation", self.documentation_specialist, self.documentation_task),
+                ("devops", self.devops_engineer, self.devops_task),
+                ("security", self.security_specialist, self.security_task)
+            ]
+        }
+
+    async def analyze_codebase_async(self):
+        """Run all agent analyses concurrently, streaming output to disk"""
         print("🚀 Starting AI Development Team Analysis...")
         print(f"📂 Analyzing project: {self.project_path}")
-        
+
         try:
-            # Execute the crew
-            result = self.crew.kickoff()
-            
-            # Save results
-            self.save_results(result)
-            
+            # Open the report up front so there is an on-disk record from
+            # the first token onward, not only after the crew finishes
+            report_path = await self.create_report()
+
+            async def run_crew(name, crew):
+                # Each crew streams into its own transcript file through
+                # its agent's handler, so concurrent tasks (and
+                # concurrent projects under analyze_many) stay readable
+                # and never share a file handle
+                handler = self.file_write_handlers[name]
+                transcript_path = report_path.replace(".md", f"_{name}_transcript.md")
+                with open(transcript_path, "w") as transcript:
+                    handler.file = transcript
+                    try:
+                        return await asyncio.to_thread(crew.kickoff)
+                    finally:
+                        handler.file = None
+
+            # Fan out: kick off every crew at once and wait for the slowest
+            results = await asyncio.gather(
+                *[run_crew(name, crew) for name, crew in self.crews.items()]
+            )
+
+            # Fan in: synthesize the per-agent results into one report
+            await self.save_results(results, report_path)
+
             print("✅ Analysis complete! Check the reports in ./reports/")
-            return result
-            
+            return results
+
         except Exception as e:
             print(f"❌ Error during analysis: {str(e)}")
             return None
-    
-    def save_results(self, result):
-        """Save analysis results to files"""
-        import os
+
+    def analyze_codebase(self):
+        """Run the complete codebase analysis (sync wrapper)"""
+        return asyncio.run(self.analyze_codebase_async())
+
+    def analyze_codebase_batch(self, poll_interval: int = 60,
+                               model: str = "gpt-4-turbo-preview"):
+        """Run the analyses through the OpenAI Batch API at half token cost"""
         import json
+        import tempfile
+        from openai import OpenAI
+
+        print("🚀 Submitting AI Development Team batch analysis...")
+        print(f"📂 Analyzing project: {self.project_path}")
+
+        client = OpenAI()
+        task_map = {
+            "code_review": (self.code_reviewer, self.code_review_task),
+            "architecture": (self.architecture_advisor, self.architecture_task),
+            "documentation": (self.documentation_specialist, self.documentation_task),
+            "devops": (self.devops_engineer, self.devops_task),
+            "security": (self.security_specialist, self.security_task)
+        }
+
+        # One /v1/chat/completions request per task; the Batch API bills
+        # these at half the synchronous token price within a 24 h window,
+        # which suits nightly/CI audits that don't need answers now
+        lines = []
+        for name, (agent, task) in task_map.items():
+            lines.append(json.dumps({
+                "custom_id": name,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": model,
+                    "temperature": 0.1,
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": f"You are a {agent.role}. {agent.backstory}"
+                        },
+                        {
+                            "role": "user",
+                            "content": f"{task.description}\n\n"
+                                       f"Expected output: {task.expected_output}"
+                        }
+                    ]
+                }
+            }))
+
+        with tempfile.NamedTemporaryFile("w+b", suffix=".jsonl") as f:
+            f.write("\n".join(lines).encode())
+            f.flush()
+            f.seek(0)
+            batch_file = client.files.create(file=f, purpose="batch")
+
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        print(f"⏳ Batch {batch.id} submitted; polling every {poll_interval}s...")
+
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = client.batches.retrieve(batch.id)
+
+        if batch.status != "completed":
+            print(f"❌ Batch ended with status: {batch.status}")
+            return None
+
+        # Reassemble responses in task order via their custom_ids. Lines
+        # can fail individually (null response, populated error), so each
+        # one is checked — a single failed request must not discard the
+        # other tasks' results after a wait of up to 24 h.
+        responses = {}
+        errors = {}
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            custom_id = entry.get("custom_id", "unknown")
+            response = entry.get("response") or {}
+            if entry.get("error") or response.get("status_code") != 200:
+                errors[custom_id] = entry.get("error") or response.get("body")
+                continue
+            responses[custom_id] = response["body"]["choices"][0]["message"]["content"]
+
+        # Requests rejected before execution land in the error file
+        if batch.error_file_id:
+            for line in client.files.content(batch.error_file_id).text.splitlines():
+                if line.strip():
+                    entry = json.loads(line)
+                    errors.setdefault(
+                        entry.get("custom_id", "unknown"), entry.get("error")
+                    )
+
+        results = []
+        for name in task_map:
+            if name in responses:
+                results.append(f"### {name}\n\n{responses[name]}")
+            else:
+                error = errors.get(name, "no response returned")
+                print(f"⚠️ Batch request '{name}' failed: {error}")
+                results.append(f"### {name}\n\n⚠️ Request failed: {error}")
+
+        async def write_report():
+            report_path = await self.create_report()
+            await self.save_results(results, report_path)
+
+        asyncio.run(write_report())
+
+        print("✅ Batch analysis complete! Check the reports in ./reports/")
+        return results
+
+    @classmethod
+    async def analyze_many_async(cls, paths, max_concurrency: int = 10):
+        """Analyze several projects concurrently with bounded parallelism"""
+
+        # One crew per project, all in flight at once; the semaphore caps
+        # concurrent projects so total parallel LLM calls stay within
+        # provider rate limits.
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def analyze(path):
+            async with semaphore:
+                return await cls(project_path=path).analyze_codebase_async()
+
+        return await asyncio.gather(*[analyze(path) for path in paths])
+
+    @classmethod
+    def analyze_many(cls, paths, max_concurrency: int = 10):
+        """Analyze several projects (sync wrapper)"""
+        return asyncio.run(cls.analyze_many_async(paths, max_concurrency))
+
+    async def create_report(self):
+        """Create the timestamped report file and write its header"""
+        import aiofiles
+        import os
         from datetime import datetime
-        
-        # Create reports directory
+
+        # Create reports directory off the event loop
         reports_dir = os.path.join(self.project_path, "reports")
-        os.makedirs(reports_dir, exist_ok=True)
-        
+        await asyncio.to_thread(os.makedirs, reports_dir, exist_ok=True)
+
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Save main report
-        with open(f"{reports_dir}/analysis_report_{timestamp}.md", "w") as f:
-            f.write("# AI Development Team Analysis Report\n\n")
-            f.write(f"Generated: {datetime.now().isoformat()}\n\n")
-            f.write(str(result))
-        
-        print(f"📄 Report saved to: {reports_dir}/analysis_report_{timestamp}.md")
+        report_path = f"{reports_dir}/analysis_report_{timestamp}.md"
+
+        async with aiofiles.open(report_path, "w") as f:
+            await f.write("# AI Development Team Analysis Report\n\n")
+            await f.write(f"Generated: {datetime.now().isoformat()}\n\n")
+
+        return report_path
+
+    async def save_results(self, results, report_path):
+        """Append the final analysis results to the report"""
+        import aiofiles
+
+        # Multi-megabyte reports flush in aiofiles' worker thread, so
+        # concurrent analyses (analyze_many) keep making progress
+        async with aiofiles.open(report_path, "a") as f:
+            await f.write("\n## Final Results\n\n")
+            await f.write("\n\n".join(str(result) for result in results))
+
+        print(f"📄 Report saved to: {report_path}")
 
 def main():
     """Main execution function"""
     import argparse
     
     parser = argparse.ArgumentParser(description="AI Development Team - Codebase Analysis")
-    parser.add_argument("--path", default=".", help="Path to project directory")
+    parser.add_argument("--path", default=".", nargs="+", help="Path(s) to project directories")
+    parser.add_argument("--max-concurrency", type=int, default=10,
+                        help="Maximum projects analyzed in parallel")
+    parser.add_argument("--batch", action="store_true",
+                        help="Submit via the OpenAI Batch API (half cost, up to 24h)")
     parser.add_argument("--config", help="Configuration file path")
-    
+
     args = parser.parse_args()
-    
-    # Initialize and run the development crew
-    crew = DevelopmentCrew(project_path=args.path)
-    crew.analyze_codebase()
+    paths = [args.path] if isinstance(args.path, str) else args.path
+
+    if args.batch:
+        # Offline path for nightly/CI audits that can wait for results
+        for path in paths:
+            DevelopmentCrew(project_path=path).analyze_codebase_batch()
+    elif len(paths) > 1:
+        # Analyze all projects concurrently instead of one run per invocation
+        DevelopmentCrew.analyze_many(paths, max_concurrency=args.max_concurrency)
+    else:
+        # Initialize and run the development crew
+        crew = DevelopmentCrew(project_path=paths[0])
+        crew.analyze_codebase()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,25 +3,54 @@ FastAPI Example Application
 A modern Python web API showcasing best practices.
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import Dict, List, Optional
+import itertools
+import os
+import re
+import sys
+import redis.asyncio as aioredis
 import uvicorn
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging: lazy %-style records and an env-tunable level so
+# hot-path log calls cost nothing when the level filters them out
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING"))
 logger = logging.getLogger(__name__)
 
+# Shared user storage: Redis when REDIS_URL is set (required for
+# workers > 1, where each process would otherwise hold its own copy of
+# the in-memory store), falling back to in-process storage otherwise.
+redis_client = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Connect shared storage on startup and close it on shutdown."""
+    global redis_client
+    redis_url = os.environ.get("REDIS_URL")
+    if redis_url:
+        redis_client = aioredis.from_url(redis_url, decode_responses=True)
+        await seed_users()
+    yield
+    if redis_client is not None:
+        await redis_client.aclose()
+        redis_client = None
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Template2 Python Example API",
     description="A showcase of modern Python web development with FastAPI",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -33,34 +62,106 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (e.g. the users list) for non-LAN clients;
+# small payloads are left alone since compression overhead wouldn't pay off
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
 # Security
 security = HTTPBearer()
 
-# Pydantic models
-class User(BaseModel):
-    """User model with validation."""
-    id: int
-    name: str = Field(..., min_length=1, max_length=100)
-    email: str = Field(..., regex=r'^[^@]+@[^@]+\.[^@]+$')
-    age: Optional[int] = Field(None, gt=0, le=150)
+# Compiled once at import so validation is a single match call per request
+_EMAIL_RE = re.compile(r'^[^@]+@[^@]+\.[^@]+$')
 
+# Pydantic models
 class UserCreate(BaseModel):
     """User creation model."""
     name: str = Field(..., min_length=1, max_length=100)
-    email: str = Field(..., regex=r'^[^@]+@[^@]+\.[^@]+$')
+    email: str
     age: Optional[int] = Field(None, gt=0, le=150)
 
+    @field_validator('email')
+    @classmethod
+    def validate_email(cls, value):
+        """Validate email against the precompiled pattern."""
+        if not _EMAIL_RE.match(value):
+            raise ValueError("Invalid email address")
+        return value
+
+class User(UserCreate):
+    """User model with validation."""
+    id: int
+
 class HealthCheck(BaseModel):
     """Health check response model."""
     status: str
     version: str
     environment: str
 
-# In-memory storage (replace with database in production)
-users_db: List[User] = [
-    User(id=1, name="Alice Johnson", email="alice@example.com", age=30),
-    User(id=2, name="Bob Smith", email="bob@example.com", age=25),
-]
+# In-memory storage keyed by user ID for O(1) lookups, used only when no
+# REDIS_URL is configured. It lives in-process, so multi-worker
+# deployments must set REDIS_URL to share state across workers.
+users_db: Dict[int, User] = {
+    1: User(id=1, name="Alice Johnson", email="alice@example.com", age=30),
+    2: User(id=2, name="Bob Smith", email="bob@example.com", age=25),
+}
+
+# Monotonic ID allocator for the in-memory store. itertools.count is
+# atomic under the GIL, so concurrent creates get distinct IDs without a
+# lock, and insertion no longer scans the whole store for max(id).
+_next_user_id = itertools.count(max(users_db, default=0) + 1).__next__
+
+def _user_key(user_id: int) -> str:
+    """Redis key for a user hash."""
+    return f"user:{user_id}"
+
+def _to_hash(user: User) -> dict:
+    """Flatten a User into a Redis hash mapping."""
+    return {key: value for key, value in user.model_dump().items() if value is not None}
+
+async def seed_users():
+    """Seed the demo users into Redis on first startup."""
+    if await redis_client.setnx("user:next_id", max(users_db, default=0)):
+        for user in users_db.values():
+            await redis_client.hset(_user_key(user.id), mapping=_to_hash(user))
+
+async def fetch_users() -> List[User]:
+    """Load all users from the active store."""
+    if redis_client is None:
+        return list(users_db.values())
+    users = []
+    async for key in redis_client.scan_iter(match="user:*"):
+        if key == "user:next_id":
+            continue
+        users.append(User(**await redis_client.hgetall(key)))
+    return sorted(users, key=lambda user: user.id)
+
+async def fetch_user(user_id: int) -> Optional[User]:
+    """Load a single user, or None if absent."""
+    if redis_client is None:
+        return users_db.get(user_id)
+    data = await redis_client.hgetall(_user_key(user_id))
+    return User(**data) if data else None
+
+async def store_user(user: User):
+    """Insert or replace a user in the active store."""
+    if redis_client is None:
+        users_db[user.id] = user
+    else:
+        # Delete first so fields dropped by an update don't linger
+        await redis_client.delete(_user_key(user.id))
+        await redis_client.hset(_user_key(user.id), mapping=_to_hash(user))
+
+async def remove_user(user_id: int) -> bool:
+    """Delete a user; return False if it did not exist."""
+    if redis_client is None:
+        return users_db.pop(user_id, None) is not None
+    return await redis_client.delete(_user_key(user_id)) > 0
+
+async def next_user_id() -> int:
+    """Allocate the next user ID."""
+    if redis_client is None:
+        return _next_user_id()
+    return int(await redis_client.incr("user:next_id"))
 
 # Dependency injection
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
@@ -93,47 +194,44 @@ async def health_check():
 async def get_users():
     """Get all users."""
     logger.info("Fetching all users")
-    return users_db
+    return await fetch_users()
 
 @app.get("/users/{user_id}", response_model=User)
 async def get_user(user_id: int):
     """Get user by ID."""
-    logger.info(f"Fetching user with ID: {user_id}")
-    user = next((user for user in users_db if user.id == user_id), None)
-    if not user:
+    logger.info("Fetching user with ID: %s", user_id)
+    user = await fetch_user(user_id)
+    if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
 @app.post("/users", response_model=User, status_code=201)
 async def create_user(user: UserCreate):
     """Create a new user."""
-    logger.info(f"Creating new user: {user.name}")
-    new_id = max(user.id for user in users_db) + 1 if users_db else 1
-    new_user = User(id=new_id, **user.dict())
-    users_db.append(new_user)
+    logger.info("Creating new user: %s", user.name)
+    new_id = await next_user_id()
+    new_user = User(id=new_id, **user.model_dump())
+    await store_user(new_user)
     return new_user
 
 @app.put("/users/{user_id}", response_model=User)
 async def update_user(user_id: int, user_update: UserCreate):
     """Update an existing user."""
-    logger.info(f"Updating user with ID: {user_id}")
-    user_index = next((i for i, user in enumerate(users_db) if user.id == user_id), None)
-    if user_index is None:
+    logger.info("Updating user with ID: %s", user_id)
+    if await fetch_user(user_id) is None:
         raise HTTPException(status_code=404, detail="User not found")
-    
-    updated_user = User(id=user_id, **user_update.dict())
-    users_db[user_index] = updated_user
+
+    updated_user = User(id=user_id, **user_update.model_dump())
+    await store_user(updated_user)
     return updated_user
 
 @app.delete("/users/{user_id}", status_code=204)
 async def delete_user(user_id: int):
     """Delete a user."""
-    logger.info(f"Deleting user with ID: {user_id}")
-    user_index = next((i for i, user in enumerate(users_db) if user.id == user_id), None)
-    if user_index is None:
+    logger.info("Deleting user with ID: %s", user_id)
+    if not await remove_user(user_id):
         raise HTTPException(status_code=404, detail="User not found")
-    
-    users_db.pop(user_index)
+
     return {"message": "User deleted successfully"}
 
 @app.get("/protected", dependencies=[Depends(get_current_user)])
@@ -147,15 +245,26 @@ async def value_error_handler(request, exc):
     """Handle value errors."""
     return {"error": "Invalid value provided", "detail": str(exc)}
 
-def start_server():
-    """Start the development server."""
-    uvicorn.run(
-        "src.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
+def start_server(dev: bool = False):
+    """Start the server: uvloop + one worker per core, or reload mode with --dev."""
+    if dev:
+        uvicorn.run(
+            "src.main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            log_level="info"
+        )
+    else:
+        uvicorn.run(
+            "src.main:app",
+            host="0.0.0.0",
+            port=8000,
+            loop="uvloop",
+            http="httptools",
+            workers=os.cpu_count(),
+            log_level="info"
+        )
 
 if __name__ == "__main__":
-    start_server()
\ No newline at end of file
+    start_server(dev="--dev" in sys.argv)
\ No newline at end of file
@@ -9,6 +9,13 @@ from src.main import app, users_db, User
 # Create test client
 client = TestClient(app)
 
+# Seed users validated once at import; the autouse fixture reuses them
+# instead of re-running Pydantic construction before every test
+_SEED_USERS = (
+    User(id=1, name="Alice Johnson", email="alice@example.com", age=30),
+    User(id=2, name="Bob Smith", email="bob@example.com", age=25),
+)
+
 class TestAPI:
     """Test cases for the API endpoints."""
 
@@ -205,11 +212,7 @@ class TestUserModel:
 @pytest.fixture(autouse=True)
 def reset_users_db():
     """Reset the users database before each test."""
-    global users_db
     users_db.clear()
-    users_db.extend([
-        User(id=1, name="Alice Johnson", email="alice@example.com", age=30),
-        User(id=2, name="Bob Smith", email="bob@example.com", age=25),
-    ])
+    users_db.update({user.id: user for user in _SEED_USERS})
     yield
     users_db.clear()
\ No newline at end of file